@@ -28,11 +28,31 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import atexit
 import shutil
+import stat as _stat
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 try:
     from dotenv import load_dotenv
 except Exception:
     def load_dotenv(*args, **kwargs):
         return False
+try:
+    import orjson  # optional: much faster JSON decode/encode
+except Exception:
+    orjson = None
+try:
+    import ijson  # optional: streaming parser for large feed files
+except Exception:
+    ijson = None
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps(obj) -> bytes:
+    # Pretty JSON (2-space indent, trailing newline) as UTF-8 bytes
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
 
 # ========= Dual output: console + log (robust) =========
 # Capture the original streams *before* we replace them.
@@ -48,7 +68,6 @@ class _Tee:
                 t.write(data)
             except Exception:
                 pass
-        self.flush()
     def flush(self):
         for t in self.targets:
             try:
@@ -59,7 +78,7 @@ class _Tee:
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / f"simtagger_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
-_LOG_FP = open(LOG_FILE, "a", encoding="utf-8")
+_LOG_FP = open(LOG_FILE, "a", encoding="utf-8", buffering=1 << 16)  # 64 KiB; flushed per manifest and at exit
 
 def _close_log():
     try:
@@ -108,47 +127,39 @@ DEFAULT_FEED_ROOT   = Path(r"Z:\projects\sceneryRSS")
 DEFAULT_DEST_ROOT   = Path(r"E:\MFS2020&2024 Addons\Airports")
 DEFAULT_SPACE_MARGIN_BYTES = 250 * 1024 * 1024  # 250 MiB safety margin
 DEFAULT_ACCEPTED_TAG = "MSFS 2020/2024"
+DEFAULT_JOBS = min(16, (os.cpu_count() or 4) * 2)
+FEED_STREAM_MIN_BYTES = 1024 * 1024  # stream feed files at least this big (needs ijson)
+
+def _parse_argv(argv: List[str]) -> Dict[str, str]:
+    # One pass over argv: accepts both --flag=value and --flag value (first occurrence wins)
+    args: Dict[str, str] = {}
+    for i, a in enumerate(argv):
+        if not a.startswith("--"):
+            continue
+        if "=" in a:
+            k, v = a.split("=", 1)
+            args.setdefault(k, v)
+        elif i+1 < len(argv):
+            args.setdefault(a, argv[i+1])
+    return args
+
+_ARGS = _parse_argv(sys.argv)
+_ARG_FLAGS = {a for a in sys.argv if a.startswith("--")}
+APPLY = "--apply" in _ARG_FLAGS
 
 def _arg_or_env_path(flag: str, env_name: str, default: Path) -> Path:
-    val = None
-    for i, a in enumerate(sys.argv):
-        if a.startswith(flag+"="):
-            val = a.split("=",1)[1]
-            break
-        if a == flag and i+1 < len(sys.argv):
-            val = sys.argv[i+1]
-            break
-    if not val:
-        val = os.environ.get(env_name)
+    val = _ARGS.get(flag) or os.environ.get(env_name)
     return Path(val) if val else default
 
 def _arg_or_env_int(flag: str, env_name: str, default: int) -> int:
-    val = None
-    for i, a in enumerate(sys.argv):
-        if a.startswith(flag+"="):
-            val = a.split("=",1)[1]
-            break
-        if a == flag and i+1 < len(sys.argv):
-            val = sys.argv[i+1]
-            break
-    if not val:
-        val = os.environ.get(env_name)
+    val = _ARGS.get(flag) or os.environ.get(env_name)
     try:
         return int(val) if val is not None else default
     except Exception:
         return default
 
 def _arg_or_env_str(flag: str, env_name: str, default: str) -> str:
-    val = None
-    for i, a in enumerate(sys.argv):
-        if a.startswith(flag+"="):
-            val = a.split("=",1)[1]
-            break
-        if a == flag and i+1 < len(sys.argv):
-            val = sys.argv[i+1]
-            break
-    if not val:
-        val = os.environ.get(env_name)
+    val = _ARGS.get(flag) or os.environ.get(env_name)
     return val if val is not None and val != "" else default
 
 ADDONS_ROOT = _arg_or_env_path("--addons-root", "ADDONS_ROOT", DEFAULT_ADDONS_ROOT)
@@ -156,10 +167,12 @@ FEED_ROOT   = _arg_or_env_path("--feed-root",   "FEED_ROOT",   DEFAULT_FEED_ROOT
 DEST_ROOT   = _arg_or_env_path("--dest-root",   "DEST_ROOT",   DEFAULT_DEST_ROOT)
 SPACE_MARGIN_BYTES = _arg_or_env_int("--space-margin-bytes", "SPACE_MARGIN_BYTES", DEFAULT_SPACE_MARGIN_BYTES)
 ACCEPTED_TAG = _arg_or_env_str("--accepted-tag", "ACCEPTED_TAG", DEFAULT_ACCEPTED_TAG)
+JOBS = max(1, _arg_or_env_int("--jobs", "JOBS", DEFAULT_JOBS))
 
 print(f"Roots: addons={ADDONS_ROOT} | feed={FEED_ROOT} | dest={DEST_ROOT}")
 print(f"Space margin: {SPACE_MARGIN_BYTES} bytes")
 print(f"Accepted tag: {ACCEPTED_TAG}")
+print(f"Jobs: {JOBS}")
 
 def same_drive(a: Path, b: Path) -> bool:
     try:
@@ -167,18 +180,122 @@ def same_drive(a: Path, b: Path) -> bool:
     except Exception:
         return True  # assume same when uncertain
 
+# Cross-drive copies: let the OS do the work where it can (reflink / in-kernel
+# copy on Linux, CopyFileExW unbuffered for big files on Windows), else copy2.
+_UNBUFFERED_COPY_MIN_BYTES = 64 * 1024 * 1024
+_COPY_FILE_NO_BUFFERING = 0x00001000
+_CopyFileExW = None
+if os.name == "nt":
+    try:
+        import ctypes
+        from ctypes import wintypes
+        _CopyFileExW = ctypes.WinDLL("kernel32", use_last_error=True).CopyFileExW
+        _CopyFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+                                 ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD]
+        _CopyFileExW.restype = wintypes.BOOL
+    except Exception:
+        _CopyFileExW = None
+
+def _copy_file_range(src: str, dst: str) -> None:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = 0
+        while True:
+            n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30)
+            if n <= 0:
+                break
+            copied += n
+        # Some filesystems return short/0 early; never report success on a partial copy
+        if copied != size:
+            raise OSError(f"copy_file_range copied {copied} of {size} bytes: {src}")
+    shutil.copystat(src, dst)
+
+def _fast_copy(src, dst, *, follow_symlinks=True):
+    # copy_function for shutil.move/copytree; same contract as shutil.copy2
+    try:
+        if _CopyFileExW is not None:
+            if os.path.getsize(src) >= _UNBUFFERED_COPY_MIN_BYTES:
+                if _CopyFileExW(str(src), str(dst), None, None, None, _COPY_FILE_NO_BUFFERING):
+                    return dst
+        elif hasattr(os, "copy_file_range"):
+            _copy_file_range(src, dst)
+            return dst
+    except OSError:
+        pass
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
 def directory_size_bytes(dir_path: Path) -> int:
     total = 0
-    # Walk files; skip directories
-    for p in dir_path.rglob("*"):
+    # Walk with os.scandir; DirEntry type/stat info comes from the directory read
+    stack = [str(dir_path)]
+    while stack:
+        d = stack.pop()
         try:
-            if p.is_file():
-                total += p.stat().st_size
-        except Exception:
-            # ignore unreadable entries
-            pass
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                        continue
+                    # One stat per entry; count regular files only
+                    st = e.stat(follow_symlinks=False)
+                    if _stat.S_ISREG(st.st_mode):
+                        total += st.st_size
+                except OSError:
+                    # ignore unreadable entries
+                    pass
     return total
 
+def iter_manifests(root: Path):
+    # Walk with os.scandir and stop descending once a folder's own manifest.json
+    # is found (addon packages don't nest manifests).
+    stack = [str(root)]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        sub = []
+        found = None
+        with it:
+            for e in it:
+                try:
+                    if e.name.lower() == "manifest.json" and e.is_file(follow_symlinks=False):
+                        found = e.path
+                    elif e.is_dir(follow_symlinks=False):
+                        sub.append(e.path)
+                except OSError:
+                    pass
+        if found:
+            yield Path(found)
+        else:
+            stack.extend(sub)
+
+class FreeSpaceTracker:
+    # Queries free space once, then tracks it locally: dry runs subtract each
+    # predicted copy, apply runs refresh after each real cross-drive move.
+    def __init__(self, root: Path):
+        self.root = root
+        self.free: Optional[int] = None
+
+    def refresh(self) -> int:
+        self.free = shutil.disk_usage(self.root).free
+        return self.free
+
+    def available(self) -> int:
+        return self.free if self.free is not None else self.refresh()
+
+    def check(self, need: int) -> bool:
+        return need <= self.available()
+
+    def commit(self, n: int):
+        if self.free is not None:
+            self.free -= n
+
 def human_bytes(n: int) -> str:
     # Simple IEC units
     for unit in ("bytes","KiB","MiB","GiB","TiB"):
@@ -190,12 +307,13 @@ def human_bytes(n: int) -> str:
 # ---------------------------
 # Regex helpers
 # ---------------------------
-RE_VERSION_IN_TITLE = re.compile(r"(?:^|[\s\-_])v?(\d+(?:[.\-_]\d+){0,3})(?:\b|$)", re.IGNORECASE)
+RE_VERSION_IN_TITLE = re.compile(r"(?:^|[\s\-_])v?(?P<v>\d+(?:[.\-_]\d+){0,3})(?:\b|$)", re.IGNORECASE)
 RE_ICAO_IN_DESC     = re.compile(r"ICAO:\s*([A-Za-z]{4})", re.IGNORECASE)
 RE_ANY_ICAO         = re.compile(r"\b([A-Za-z]{4})\b")
-RE_FOLDER_ICAO      = re.compile(r"(?:^|[-_ ])([A-Za-z]{4})(?:$|[-_ ])")  # …-vtbu-… (case-insensitive)
+RE_FOLDER_ICAO      = re.compile(r"(?:^|[-_ ])([A-Za-z]{4})(?=[-_ ]|$)")  # …-vtbu-… (case-insensitive)
 RE_SLUG_ICAO        = re.compile(r"(?:^|[-_/])([a-z]{4})(?:[-_/]|$)", re.IGNORECASE)
 
+@lru_cache(maxsize=8192)
 def norm_version(v: str) -> Optional[Tuple[int,int,int]]:
     if not v: return None
     v = v.strip().lstrip("vV").replace("_",".").replace("-", ".")
@@ -216,45 +334,61 @@ def normalize_version_string(v: str) -> Optional[str]:
     nv = norm_version(v)
     return ".".join(map(str, nv)) if nv else None
 
-def extract_version_from_title(title: str) -> Optional[str]:
+@lru_cache(maxsize=8192)
+def extract_version_from_title(title: str) -> Optional[Tuple[int,int,int]]:
     m = RE_VERSION_IN_TITLE.search(title or "")
-    return normalize_version_string(m.group(1)) if m else None
+    return norm_version(m.group("v")) if m else None
 
+# ICAO tokens returned below are interned: the same few thousand 4-letter codes
+# recur across feed items and manifests, so index keys share one object each.
 def find_icaos_in_entry(title: str, desc: str, page_url: str) -> List[str]:
     # 1) Prefer explicit "ICAO: XXXX" in description
     m = RE_ICAO_IN_DESC.search(desc or "")
     if m:
-        return [m.group(1).upper()]
+        return [sys.intern(m.group(1).upper())]
     # 2) Look in title for any 4-letter token (case-insensitive)
-    t_found = {tok.upper() for tok in RE_ANY_ICAO.findall(title or "")}
     # 3) Also search page_url slug (often contains -vtbu- style)
-    slug_found = {tok.upper() for tok in RE_SLUG_ICAO.findall(page_url or "")}
-    found = list(sorted(t_found.union(slug_found)))
+    # Order doesn't matter to the index, so just dedupe in first-seen order.
+    found: List[str] = []
+    seen = set()
+    for rx, text in ((RE_ANY_ICAO, title), (RE_SLUG_ICAO, page_url)):
+        if not text: continue
+        for mm in rx.finditer(text):
+            tok = mm.group(1).upper()
+            if tok not in seen:
+                seen.add(tok)
+                found.append(sys.intern(tok))
     return found
 
+@lru_cache(maxsize=4096)
 def folder_icao(folder_name: str) -> Optional[str]:
-    m = RE_FOLDER_ICAO.search(folder_name or "")
-    if not m: return None
-    tok = m.group(1)
-    return tok.upper() if tok and len(tok)==4 and tok.isalpha() else None
+    # Single scan: the pattern already guarantees exactly four ASCII letters
+    if not folder_name or len(folder_name) < 4:
+        return None
+    m = RE_FOLDER_ICAO.search(folder_name)
+    return sys.intern(m.group(1).upper()) if m else None
 
+@lru_cache(maxsize=4096)
 def manifest_icao_from_title(manifest_title: str) -> Optional[str]:
     for m in RE_ANY_ICAO.finditer(manifest_title or ""):
         tok = m.group(1)
         if len(tok) == 4 and tok.isalpha():
-            return tok.upper()
+            return sys.intern(tok.upper())
     return None
 
 # ---------------------------
 # Feed indexing
 # ---------------------------
 class FeedItem:
+    # Slots: one instance per accepted feed entry, no per-instance __dict__
+    __slots__ = ("source", "title", "description", "page_url", "tag", "version", "icaos")
+
     def __init__(self, source: Path, raw: dict):
         self.source = source
         self.title = (raw.get("title") or "").strip()
         self.description = (raw.get("description") or "").strip()
         self.page_url = (raw.get("page_url") or raw.get("link") or "").strip()
-        self.tag = (raw.get("tag") or raw.get("category") or "").strip()
+        self.tag = sys.intern((raw.get("tag") or raw.get("category") or "").strip())
         self.version = extract_version_from_title(self.title)
         self.icaos = find_icaos_in_entry(self.title, self.description, self.page_url)
 
@@ -263,40 +397,103 @@ class FeedItem:
 
 class FeedIndex:
     def __init__(self):
-        # (ICAO, version) -> tag string
-        self.index: Dict[Tuple[str, str], str] = {}
+        # (ICAO, (major, minor, patch)) -> tag string
+        self.index: Dict[Tuple[str, Tuple[int,int,int]], str] = {}
 
-    def add_item(self, item: FeedItem):
-        if not item.is_msfs():
-            return
+    def _add_item_unchecked(self, item: FeedItem):
+        # Caller has already filtered with item.is_msfs()
         for icao in item.icaos:
-            key = (icao.upper(), item.version)
+            key = (sys.intern(icao.upper()), item.version)
             self.index[key] = item.tag  # always store exact tag
 
+def _stream_feed_raw(f):
+    # Yield raw feed entries one at a time from either a top-level list or {"items": [...]}
+    head = f.read(64).lstrip()
+    while not head:
+        chunk = f.read(64)
+        if not chunk:
+            return iter(())
+        head = chunk.lstrip()
+    f.seek(0)
+    return ijson.items(f, "item" if head[:1] == b"[" else "items.item")
+
+def _parse_feed_file(fp: Path):
+    # Returns (list of FeedItem, error or None); safe to run in a worker thread
+    try:
+        if ijson is not None and fp.stat().st_size >= FEED_STREAM_MIN_BYTES:
+            # Large file: never hold the whole decoded document in memory
+            with open(fp, "rb") as f:
+                return _collect_feed_items(fp, _stream_feed_raw(f)), None
+        data = _loads(fp.read_bytes())
+    except Exception as e:
+        return [], e
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return [], None
+    return _collect_feed_items(fp, items), None
+
+def _collect_feed_items(fp: Path, items) -> List[FeedItem]:
+    out = []
+    append = out.append
+    accepted = ACCEPTED_TAG  # local lookup in the per-item loop
+    for raw in items:
+        if not isinstance(raw, dict): continue
+        # Only ACCEPTED_TAG entries are ever indexed; skip the rest before any regex work
+        tag = raw.get("tag") or raw.get("category")
+        if not isinstance(tag, str) or tag.strip() != accepted: continue
+        item = FeedItem(fp, raw)
+        if item.is_msfs():  # the only is_msfs() check; the index trusts it
+            append(item)
+    return out
+
 def load_feed_index(feed_root: Path) -> FeedIndex:
     idx = FeedIndex()
     # Process files sorted by name so later files (typically newer) can override
-    for fp in sorted(feed_root.glob("*.json")):
-        try:
-            data = json.loads(fp.read_text(encoding="utf-8"))
-        except Exception as e:
+    feed_files = sorted(feed_root.glob("*.json"))
+    # Parse files in parallel, but merge strictly in sorted order
+    if JOBS > 1 and len(feed_files) > 1:
+        with ThreadPoolExecutor(max_workers=JOBS) as ex:
+            parsed = list(ex.map(_parse_feed_file, feed_files))
+    else:
+        parsed = [_parse_feed_file(fp) for fp in feed_files]
+    for fp, (items, e) in zip(feed_files, parsed):
+        if e is not None:
             print(f"ERROR reading {fp}: {e}")
             continue
-        items = data.get("items") if isinstance(data, dict) else data
-        if not isinstance(items, list):
-            continue
-        for raw in items:
-            if not isinstance(raw, dict): continue
-            item = FeedItem(fp, raw)
-            if item.is_msfs():
-                idx.add_item(item)
+        for item in items:
+            idx._add_item_unchecked(item)
     return idx
 
 # ---------------------------
 # Main work
 # ---------------------------
+def _read_manifest(man_path: Path):
+    # Returns (path, manifest dict or None, error or None); safe to run in a worker thread
+    try:
+        return man_path, _loads(man_path.read_bytes()), None
+    except Exception as e:
+        return man_path, None, e
+
+def _write_manifest(man_path: Path, manifest: dict):
+    # Write to a sibling temp file, fsync it, then swap it in atomically so neither
+    # a crash nor a power loss can leave a truncated manifest.json behind.
+    tmp = man_path.with_suffix(".json.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_dumps(manifest))
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(man_path, tmp)  # keep the original file's permissions
+        os.replace(tmp, man_path)
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
 def main():
-    apply = ("--apply" in sys.argv)
+    apply = APPLY
     if not ADDONS_ROOT.exists():
         print(f"ERROR: Addons root not found: {ADDONS_ROOT}")
         return
@@ -320,141 +517,182 @@ def main():
         "will_no_space":0, "no_space":0
     }
     bad_json_files = []  # collect for grouped summary
+    dest_space = FreeSpaceTracker(DEST_ROOT)  # free space on DEST_ROOT, queried lazily
 
     # Collect manifests first to avoid interference when moving directories
-    manifest_paths = list(ADDONS_ROOT.rglob("manifest.json"))
-    for man_path in manifest_paths:
-        folder_name = man_path.parent.name
+    manifest_paths = list(iter_manifests(ADDONS_ROOT))
+    # Read+parse in parallel; matching, printing and moves stay serial and in order
+    if JOBS > 1 and len(manifest_paths) > 1:
+        with ThreadPoolExecutor(max_workers=JOBS) as ex:
+            parsed = list(ex.map(_read_manifest, manifest_paths))
+    else:
+        parsed = [_read_manifest(p) for p in manifest_paths]
+    # Hot loop: bind globals/attributes to locals and count in local ints
+    get_tag = idx.index.get
+    norm_ver = norm_version
+    icao_of_folder = folder_icao
+    icao_of_title = manifest_icao_from_title
+    accepted = ACCEPTED_TAG
+    add_bad_json = bad_json_files.append
+    emit = print
+    flush = sys.stdout.flush
+    n_will_update = n_updated = n_noop = n_no_version = n_no_match = n_bad_json = 0
+    n_will_move = n_moved = n_skip_exist = n_move_failed = 0
+    n_will_no_space = n_no_space = 0
+    for man_path, manifest, e in parsed:
+        # Buffer this manifest's lines and emit them in one write
+        log_lines = []
+        out = log_lines.append
         try:
-            manifest = json.loads(man_path.read_text(encoding="utf-8"))
-        except Exception as e:
-            # inline console + log (kept)
-            print(f"BAD_JSON    | {man_path} | {e}")
-            counts["bad_json"] += 1
-            bad_json_files.append(f"{man_path} | {e}")  # for grouped block
-            continue
-
-        man_version = (manifest.get("package_version") or "").strip()
-        if not man_version:
-            print(f"NO_VERSION  | {man_path}")
-            counts["no_version"] += 1
-            continue
-        man_version_norm = normalize_version_string(man_version)
-        if not man_version_norm:
-            print(f"NO_VERSION  | {man_path}")
-            counts["no_version"] += 1
-            continue
-
-        # Determine ICAO: prefer folder name pattern like ...-vtbu-...
-        icao = folder_icao(folder_name)
-        if not icao:
-            # fallback to manifest title
-            icao = manifest_icao_from_title(manifest.get("title","")) or None
-
-        if not icao:
-            print(f"NO_MATCH    | ???? | v{man_version} | {man_path}")
-            counts["no_match"] += 1
-            continue
-
-        key = (icao.upper(), man_version_norm)
-        tag = idx.index.get(key)
-        if not tag:
-            print(f"NO_MATCH    | {icao} | v{man_version_norm} | {man_path}")
-            counts["no_match"] += 1
-            continue
-
-        before = manifest.get("simType")
-        after  = tag  # exact tag from feed JSON, e.g., "MSFS 2020/2024"
-
-        needs_update = (before != after)
-
-        # Update simType or preview it
-        if apply:
-            if needs_update:
-                manifest["simType"] = after
-                man_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-                print(f"UPDATED     | {icao} | v{man_version_norm} | simType {before} -> {after} | {man_path}")
-                counts["updated"] += 1
-            else:
-                print(f"NOOP        | {icao} | v{man_version_norm} | simType already {before} | {man_path}")
-                counts["noop"] += 1
-        else:
-            if needs_update:
-                print(f"WILL_UPDATE | {icao} | v{man_version_norm} | simType {before} -> {after} | {man_path}")
-                counts["will_update"] += 1
-            else:
-                print(f"NOOP        | {icao} | v{man_version_norm} | simType already {before} | {man_path}")
-                counts["noop"] += 1
-
-        # Move airport folder when tagged for MSFS 2020/2024
-        if after == ACCEPTED_TAG:
-            src_dir = man_path.parent
-            try:
-                rel_subpath = src_dir.relative_to(ADDONS_ROOT)
-            except Exception:
-                rel_subpath = Path(src_dir.name)
-            dest_dir = DEST_ROOT / rel_subpath
-
-            # Determine move mode: rename (same drive) vs copy+delete (cross-drive)
-            is_rename = same_drive(src_dir, DEST_ROOT)
-
+            folder_name = man_path.parent.name
+            if e is not None:
+                # inline console + log (kept)
+                out(f"BAD_JSON    | {man_path} | {e}")
+                n_bad_json += 1
+                add_bad_json(f"{man_path} | {e}")  # for grouped block
+                continue
+
+            man_version = (manifest.get("package_version") or "").strip()
+            if not man_version:
+                out(f"NO_VERSION  | {man_path}")
+                n_no_version += 1
+                continue
+            man_version_tuple = norm_ver(man_version)
+            if not man_version_tuple:
+                out(f"NO_VERSION  | {man_path}")
+                n_no_version += 1
+                continue
+            man_version_norm = "%d.%d.%d" % man_version_tuple  # display only
+
+            # Determine ICAO: prefer folder name pattern like ...-vtbu-...
+            icao = icao_of_folder(folder_name)
+            if not icao:
+                # fallback to manifest title
+                icao = icao_of_title(manifest.get("title","")) or None
+
+            if not icao:
+                out(f"NO_MATCH    | ???? | v{man_version} | {man_path}")
+                n_no_match += 1
+                continue
+
+            key = (icao, man_version_tuple)  # icao is already upper-cased and interned
+            tag = get_tag(key)
+            if not tag:
+                out(f"NO_MATCH    | {icao} | v{man_version_norm} | {man_path}")
+                n_no_match += 1
+                continue
+
+            before = manifest.get("simType")
+            after  = tag  # exact tag from feed JSON, e.g., "MSFS 2020/2024"
+
+            needs_update = (before != after)
+
+            # Update simType or preview it
             if apply:
-                if dest_dir.exists():
-                    print(f"SKIP_EXIST  | {icao} | v{man_version_norm} | dest exists | {dest_dir}")
-                    counts["skip_exist"] += 1
+                if needs_update:
+                    manifest["simType"] = after
+                    _write_manifest(man_path, manifest)
+                    out(f"UPDATED     | {icao} | v{man_version_norm} | simType {before} -> {after} | {man_path}")
+                    n_updated += 1
                 else:
-                    # For cross-drive moves, preflight free space check
-                    if not is_rename:
-                        try:
-                            size_bytes = directory_size_bytes(src_dir)
-                            free_bytes = shutil.disk_usage(DEST_ROOT).free
-                            required = size_bytes + SPACE_MARGIN_BYTES
-                            if required > free_bytes:
-                                print(
-                                    f"NO_SPACE    | {icao} | v{man_version_norm} | required {human_bytes(required)} > free {human_bytes(free_bytes)} | {src_dir} -> {dest_dir}"
-                                )
-                                counts["no_space"] += 1
-                                # Skip move
-                                continue
-                        except Exception:
-                            # If space check fails, attempt move anyway
-                            pass
-                    try:
-                        dest_dir.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.move(str(src_dir), str(dest_dir))
-                        mode = "rename" if is_rename else "copy+delete"
-                        print(f"MOVED       | {icao} | v{man_version_norm} | ({mode}) {src_dir} -> {dest_dir}")
-                        counts["moved"] += 1
-                    except Exception as e:
-                        print(f"MOVE_FAILED | {icao} | v{man_version_norm} | {src_dir} -> {dest_dir} | {e}")
-                        counts["move_failed"] += 1
+                    out(f"NOOP        | {icao} | v{man_version_norm} | simType already {before} | {man_path}")
+                    n_noop += 1
             else:
-                if dest_dir.exists():
-                    print(f"WILL_SKIP_EXIST | {icao} | v{man_version_norm} | dest exists | {dest_dir}")
-                    counts["skip_exist"] += 1
+                if needs_update:
+                    out(f"WILL_UPDATE | {icao} | v{man_version_norm} | simType {before} -> {after} | {man_path}")
+                    n_will_update += 1
                 else:
-                    if is_rename:
-                        print(f"WILL_MOVE   | {icao} | v{man_version_norm} | (rename) {src_dir} -> {dest_dir}")
-                        counts["will_move"] += 1
+                    out(f"NOOP        | {icao} | v{man_version_norm} | simType already {before} | {man_path}")
+                    n_noop += 1
+
+            # Move airport folder when tagged for MSFS 2020/2024
+            if after == accepted:
+                src_dir = man_path.parent
+                try:
+                    rel_subpath = src_dir.relative_to(ADDONS_ROOT)
+                except Exception:
+                    rel_subpath = Path(src_dir.name)
+                dest_dir = DEST_ROOT / rel_subpath
+
+                # Determine move mode: rename (same drive) vs copy+delete (cross-drive)
+                is_rename = same_drive(src_dir, DEST_ROOT)
+
+                if apply:
+                    if dest_dir.exists():
+                        out(f"SKIP_EXIST  | {icao} | v{man_version_norm} | dest exists | {dest_dir}")
+                        n_skip_exist += 1
                     else:
-                        # Pre-compute size and available space for preview
+                        # For cross-drive moves, preflight free space check
+                        if not is_rename:
+                            try:
+                                size_bytes = directory_size_bytes(src_dir)
+                                free_bytes = dest_space.available()
+                                required = size_bytes + SPACE_MARGIN_BYTES
+                                if not dest_space.check(required):
+                                    out(
+                                        f"NO_SPACE    | {icao} | v{man_version_norm} | required {human_bytes(required)} > free {human_bytes(free_bytes)} | {src_dir} -> {dest_dir}"
+                                    )
+                                    n_no_space += 1
+                                    # Skip move
+                                    continue
+                            except Exception:
+                                # If space check fails, attempt move anyway
+                                pass
                         try:
-                            size_bytes = directory_size_bytes(src_dir)
-                            free_bytes = shutil.disk_usage(DEST_ROOT).free
-                            required = size_bytes + SPACE_MARGIN_BYTES
-                            if required > free_bytes:
-                                print(
-                                    f"WILL_NO_SPACE | {icao} | v{man_version_norm} | required {human_bytes(required)} > free {human_bytes(free_bytes)} | {src_dir} -> {dest_dir}"
-                                )
-                                counts["will_no_space"] += 1
-                            else:
-                                print(
-                                    f"WILL_MOVE   | {icao} | v{man_version_norm} | (copy+delete, size {human_bytes(size_bytes)}, free {human_bytes(free_bytes)}, margin {human_bytes(SPACE_MARGIN_BYTES)}) {src_dir} -> {dest_dir}"
-                                )
-                                counts["will_move"] += 1
-                        except Exception:
-                            print(f"WILL_MOVE   | {icao} | v{man_version_norm} | (copy+delete) {src_dir} -> {dest_dir}")
-                            counts["will_move"] += 1
+                            dest_dir.parent.mkdir(parents=True, exist_ok=True)
+                            # Same drive: plain rename. Cross-drive: shutil.move copies with
+                            # _fast_copy, then removes the source tree.
+                            shutil.move(str(src_dir), str(dest_dir), copy_function=_fast_copy)
+                            mode = "rename" if is_rename else "copy+delete"
+                            if not is_rename:
+                                try:
+                                    dest_space.refresh()
+                                except Exception:
+                                    pass
+                            out(f"MOVED       | {icao} | v{man_version_norm} | ({mode}) {src_dir} -> {dest_dir}")
+                            n_moved += 1
+                        except Exception as e:
+                            out(f"MOVE_FAILED | {icao} | v{man_version_norm} | {src_dir} -> {dest_dir} | {e}")
+                            n_move_failed += 1
+                else:
+                    if dest_dir.exists():
+                        out(f"WILL_SKIP_EXIST | {icao} | v{man_version_norm} | dest exists | {dest_dir}")
+                        n_skip_exist += 1
+                    else:
+                        if is_rename:
+                            out(f"WILL_MOVE   | {icao} | v{man_version_norm} | (rename) {src_dir} -> {dest_dir}")
+                            n_will_move += 1
+                        else:
+                            # Pre-compute size and available space for preview
+                            try:
+                                size_bytes = directory_size_bytes(src_dir)
+                                free_bytes = dest_space.available()
+                                required = size_bytes + SPACE_MARGIN_BYTES
+                                if not dest_space.check(required):
+                                    out(
+                                        f"WILL_NO_SPACE | {icao} | v{man_version_norm} | required {human_bytes(required)} > free {human_bytes(free_bytes)} | {src_dir} -> {dest_dir}"
+                                    )
+                                    n_will_no_space += 1
+                                else:
+                                    out(
+                                        f"WILL_MOVE   | {icao} | v{man_version_norm} | (copy+delete, size {human_bytes(size_bytes)}, free {human_bytes(free_bytes)}, margin {human_bytes(SPACE_MARGIN_BYTES)}) {src_dir} -> {dest_dir}"
+                                    )
+                                    n_will_move += 1
+                                    dest_space.commit(size_bytes)  # later previews see the reduced space
+                            except Exception:
+                                out(f"WILL_MOVE   | {icao} | v{man_version_norm} | (copy+delete) {src_dir} -> {dest_dir}")
+                                n_will_move += 1
+        finally:
+            if log_lines:
+                emit("\n".join(log_lines))
+                flush()  # one flush per manifest keeps the log current on disk
+
+    counts.update(
+        will_update=n_will_update, updated=n_updated, noop=n_noop, no_version=n_no_version,
+        no_match=n_no_match, bad_json=n_bad_json, will_move=n_will_move, moved=n_moved,
+        skip_exist=n_skip_exist, move_failed=n_move_failed,
+        will_no_space=n_will_no_space, no_space=n_no_space,
+    )
 
     print("\nSummary:")
     print(f"  WILL_UPDATE: {counts['will_update']}")
@@ -469,6 +707,8 @@ def main():
     print(f"  MOVE_FAIL  : {counts['move_failed']}")
     print(f"  WILL_NO_SPACE: {counts['will_no_space']}")
     print(f"  NO_SPACE     : {counts['no_space']}")
+    fi, ti = folder_icao.cache_info(), manifest_icao_from_title.cache_info()
+    print(f"  ICAO cache   : folder names {fi.hits} hits / {fi.misses} misses, titles {ti.hits} hits / {ti.misses} misses")
 
     if bad_json_files:
         print("\n==== BAD_JSON FILES (grouped) ====")